@@ -1,8 +1,7 @@
-import os
-import gc
-import csv
+import functools
+import numpy as np
 import polars as pl
-from typing import List, Tuple, Generator, Any, Dict
+from typing import List, Tuple, Generator, Any, Dict, Literal, NamedTuple, Sequence, Union
 from datetime import date, timedelta
 from importlib import resources
 
@@ -13,6 +12,7 @@ from prelude.log_utils import create_console_logger
 logger = create_console_logger(name=__name__)
 
 
+@functools.lru_cache(maxsize=None)
 def get_calendar_path(exchange: str) -> str:
     """
     Get the path to the calendar file for the given exchange.
@@ -29,10 +29,57 @@ def get_calendar_path(exchange: str) -> str:
 
     Notes
     -----
-    The calendar file should be put in the `src/prelude/assets` directory.
+    The calendar file should be put in the `src/prelude/assets` directory. The path is resolved once per
+    exchange and cached; the package is expected to be installed as a regular directory, not a zip.
+    Calendar files must be sorted by `TradeDate`; use `scripts/rebuild_calendar.py` to rewrite one.
     """
-    with resources.path("prelude.assets", f"{exchange}_calendar.parquet") as path:
-        return str(path)
+    return str(resources.files("prelude.assets") / f"{exchange}_calendar.parquet")
+
+
+@functools.lru_cache(maxsize=8)
+def _load_calendar(exchange: str) -> pl.DataFrame:
+    """
+    Load the calendar for the given exchange, caching the result per process.
+
+    Calendar files are small and treated as immutable, so they are parsed at most once.
+    Only the columns used by the calendar queries are read from disk.
+    """
+    return pl.scan_parquet(get_calendar_path(exchange)).select("TradeDate", "isValid", "isHalfDay").collect()
+
+
+@functools.lru_cache(maxsize=8)
+def _calendar_variants(exchange: str) -> Dict[Tuple[bool, bool], np.ndarray]:
+    """
+    Precompute the sorted int32 trading dates of an exchange for every flag combination.
+
+    Keys are `(exclude_bad_dates, include_half_days)`. The arrays are shared between callers
+    and are marked read-only.
+    """
+    df_cal = _load_calendar(exchange).sort("TradeDate")
+    trade_dates = df_cal["TradeDate"].to_numpy().astype(np.int32)
+    is_valid = df_cal["isValid"].to_numpy() == 1
+    is_full_day = df_cal["isHalfDay"].to_numpy() == 0
+
+    variants = {}
+    for exclude_bad_dates in (False, True):
+        for include_half_days in (False, True):
+            mask = np.ones(len(trade_dates), dtype=bool)
+            if exclude_bad_dates:
+                mask &= is_valid
+            if not include_half_days:
+                mask &= is_full_day
+            arr = trade_dates[mask]
+            arr.flags.writeable = False
+            variants[(exclude_bad_dates, include_half_days)] = arr
+
+    return variants
+
+
+def _filtered_calendar(exchange: str, exclude_bad_dates: bool, include_half_days: bool) -> np.ndarray:
+    """
+    Return the precomputed trading dates of an exchange for the given flags.
+    """
+    return _calendar_variants(exchange)[(bool(exclude_bad_dates), bool(include_half_days))]
 
 
 def get_date_list(
@@ -41,9 +88,10 @@ def get_date_list(
     exchange: str,
     exclude_bad_dates: bool = True,
     include_half_days: bool = True,
-) -> List[int]:
+    return_type: Literal["list", "numpy", "series"] = "numpy",
+) -> Union[List[int], np.ndarray, pl.Series]:
     """
-    Get a list of trading dates between the given start and end dates.
+    Get the trading dates between the given start and end dates.
 
     Parameters
     ----------
@@ -57,11 +105,19 @@ def get_date_list(
         Whether to exclude invalid trading dates, by default True.
     include_half_days : bool, optional
         Whether to include half trading days, by default True.
+    return_type : Literal["list", "numpy", "series"], optional
+        The container to return, by default "numpy". "numpy" returns a read-only view into the cached
+        calendar; "list" returns Python ints; "series" returns a `pl.Series` named "TradeDate".
 
     Returns
     -------
-    List[int]
-        A list of trading dates in YYYYMMDD format.
+    Union[List[int], np.ndarray, pl.Series]
+        The trading dates in YYYYMMDD format.
+
+    Raises
+    ------
+    ValueError
+        If `return_type` is not one of "list", "numpy" or "series".
 
     Notes
     -----
@@ -72,15 +128,18 @@ def get_date_list(
     """
     start_date = int(start_date)
     end_date = int(end_date)
-    df_cal = pl.read_parquet(get_calendar_path(exchange)).filter(pl.col("TradeDate").is_between(start_date, end_date))
-
-    if exclude_bad_dates:
-        df_cal = df_cal.filter(pl.col("isValid") == 1)
+    arr = _filtered_calendar(exchange, exclude_bad_dates, include_half_days)
+    lo = np.searchsorted(arr, start_date, side="left")
+    hi = np.searchsorted(arr, end_date, side="right")
+    dates = arr[lo:hi]
 
-    if not include_half_days:
-        df_cal = df_cal.filter(pl.col("isHalfDay") == 0)
-
-    return df_cal["TradeDate"].to_list()
+    if return_type == "numpy":
+        return dates
+    if return_type == "list":
+        return dates.tolist()
+    if return_type == "series":
+        return pl.Series("TradeDate", dates)
+    raise ValueError(f"Unknown return_type: {return_type!r}")
 
 
 def get_date_by_offset(
@@ -112,64 +171,139 @@ def get_date_by_offset(
     int
         The resulting date in YYYYMMDD format after applying the offset.
 
+    Raises
+    ------
+    ValueError
+        If `run_date` is not in the filtered calendar, or the offset falls outside it.
     """
-    df_cal = pl.read_parquet(get_calendar_path(exchange))
+    return int(get_dates_by_offsets(run_date, offset, exchange, exclude_bad_dates, include_half_days))
 
-    if exclude_bad_dates:
-        df_cal = df_cal.filter(pl.col("isValid") == 1)
 
-    if not include_half_days:
-        df_cal = df_cal.filter(pl.col("isHalfDay") == 0)
+def get_dates_by_offsets(
+    run_dates: Union[int, Sequence[int], np.ndarray],
+    offsets: Union[int, Sequence[int], np.ndarray],
+    exchange: str,
+    exclude_bad_dates: bool = False,
+    include_half_days: bool = True,
+) -> np.ndarray:
+    """
+    Get trading dates by applying offsets to many dates at once.
 
-    idx0 = df_cal.select((pl.col("TradeDate") == run_date).arg_true()).item()
-    return df_cal["TradeDate"][idx0 + offset]
+    Parameters
+    ----------
+    run_dates : Union[int, Sequence[int], np.ndarray]
+        The reference dates in YYYYMMDD format.
+    offsets : Union[int, Sequence[int], np.ndarray]
+        The number of trading days to offset from each reference date. Broadcast against `run_dates`.
+    exchange : str
+        The name of the exchange.
+    exclude_bad_dates : bool, optional
+        Whether to exclude invalid trading dates, by default False.
+    include_half_days : bool, optional
+        Whether to include half trading days, by default True.
 
+    Returns
+    -------
+    np.ndarray
+        The resulting dates in YYYYMMDD format, with the broadcast shape of `run_dates` and `offsets`.
 
-def create_train_val_date_splits(
-    dates: List[Any], train_window: int, val_window: int, fold_incomplete: bool = False
-) -> Generator[Tuple[List[Any], List[Any]], None, None]:
+    Raises
+    ------
+    ValueError
+        If any run date is not in the filtered calendar, or any offset falls outside it.
     """
-    Generate training and validation date splits from a list of dates, including all data.
+    run_dates, offsets = np.broadcast_arrays(np.asarray(run_dates, dtype=np.int64), np.asarray(offsets, dtype=np.int64))
+    arr = _filtered_calendar(exchange, exclude_bad_dates, include_half_days)
+    idx0 = np.searchsorted(arr, run_dates)
+
+    missing = idx0 >= len(arr)
+    if len(arr):
+        missing |= arr[np.minimum(idx0, len(arr) - 1)] != run_dates
+    if missing.any():
+        raise ValueError(f"{run_dates[missing].flat[0]} is not a trading date on the {exchange} calendar")
+
+    idx = idx0 + offsets
+    out_of_range = (idx < 0) | (idx >= len(arr))
+    if out_of_range.any():
+        raise ValueError(
+            f"Offset {offsets[out_of_range].flat[0]} from {run_dates[out_of_range].flat[0]} "
+            f"falls outside the {exchange} calendar"
+        )
+
+    return arr[idx]
+
+
+def create_train_val_index_splits(
+    n: int, train_window: int, val_window: int, fold_incomplete: bool = False
+) -> Generator[Tuple[slice, slice], None, None]:
+    """
+    Generate training and validation index slices for a sequence of length `n`, including all data.
 
     Args:
-        dates (List[Any]): A list of dates in chronological order.
+        n (int): The length of the sequence to split.
         train_window (int): The number of items for the training window.
         val_window (int): The number of items for the validation window.
         fold_incomplete (bool): If True, folds incomplete final validation data into the previous split.
 
     Yields:
-        Tuple[List[Any], List[Any]]: A tuple containing the training dates and validation dates for each split.
+        Tuple[slice, slice]: The training and validation slices for each split, usable on any sequence of length `n`.
 
     Examples:
-        >>> list(create_train_val_date_splits(list(range(10)), 3, 2, fold_incomplete=False))
-        [([0, 1, 2], [3, 4]), ([2, 3, 4], [5, 6]), ([4, 5, 6], [7, 8]), ([6, 7, 8], [9])]
-        >>> list(create_train_val_date_splits(list(range(10)), 3, 2, fold_incomplete=True))
-        [([0, 1, 2], [3, 4]), ([2, 3, 4], [5, 6]), ([4, 5, 6], [7, 8, 9])]
+        >>> list(create_train_val_index_splits(10, 3, 2, fold_incomplete=True))
+        [(slice(0, 3, None), slice(3, 5, None)), (slice(2, 5, None), slice(5, 7, None)), (slice(4, 7, None), slice(7, 10, None))]
     """
     total_window = train_window + val_window
 
-    done_flag = False
-    for start in range(0, len(dates), val_window):
-        end = start + total_window
+    if fold_incomplete:
+        # Every split that leaves at least one more full validation window after it
+        n_full = max(0, (n - total_window) // val_window)
+    else:
+        # Every split whose window fits entirely within the sequence
+        n_full = max(0, (n - total_window) // val_window + 1)
+
+    for k in range(n_full):
+        start = k * val_window
+        yield slice(start, start + train_window), slice(start + train_window, start + total_window)
+
+    # At most one trailing split remains: the folded remainder, or a partial validation window
+    start = n_full * val_window
+    if start + train_window < n:
+        yield slice(start, start + train_window), slice(start + train_window, n)
+
+
+class Fold(NamedTuple):
+    """
+    A training/validation split yielded by `create_train_val_date_splits`.
+    """
+
+    train: np.ndarray
+    val: np.ndarray
 
-        # Look ahead to see if this is the last full window
-        is_last_window = end + val_window > len(dates)
 
-        if fold_incomplete and is_last_window:
-            # For the last window, include all remaining data
-            window = dates[start:]
-            done_flag = True
-        else:
-            window = dates[start:end]
+def create_train_val_date_splits(
+    dates: Union[List[Any], np.ndarray], train_window: int, val_window: int, fold_incomplete: bool = False
+) -> Generator[Fold, None, None]:
+    """
+    Generate training and validation date splits from a list of dates, including all data.
 
-        if len(window) <= train_window:
-            # If we can't make a full training window, we're done
-            break
+    The dates are converted to a NumPy array once and each split is a view into it, so the only per-fold
+    allocation is the `Fold` tuple itself. Copy a split before modifying it if `dates` must stay intact.
 
-        train = window[:train_window]
-        val = window[train_window:]
+    Args:
+        dates (Union[List[Any], np.ndarray]): A list or array of dates in chronological order.
+        train_window (int): The number of items for the training window.
+        val_window (int): The number of items for the validation window.
+        fold_incomplete (bool): If True, folds incomplete final validation data into the previous split.
 
-        yield train, val
+    Yields:
+        Fold: A named tuple of the training dates (`train`) and validation dates (`val`) for each split.
 
-        if done_flag:
-            break
+    Examples:
+        >>> [(t.tolist(), v.tolist()) for t, v in create_train_val_date_splits(list(range(10)), 3, 2)]
+        [([0, 1, 2], [3, 4]), ([2, 3, 4], [5, 6]), ([4, 5, 6], [7, 8]), ([6, 7, 8], [9])]
+        >>> [(t.tolist(), v.tolist()) for t, v in create_train_val_date_splits(list(range(10)), 3, 2, True)]
+        [([0, 1, 2], [3, 4]), ([2, 3, 4], [5, 6]), ([4, 5, 6], [7, 8, 9])]
+    """
+    arr = np.asarray(dates)
+    for train, val in create_train_val_index_splits(len(arr), train_window, val_window, fold_incomplete):
+        yield Fold(arr[train], arr[val])
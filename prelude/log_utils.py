@@ -1,7 +1,20 @@
+import functools
 import logging
-import traceback
 from typing import Optional
 
+_FORMAT_WITH_LINE = "%(asctime)s - %(levelname)s - %(name)s - %(funcName)s:%(lineno)d - %(message)s"
+_FORMAT_NO_LINE = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+
+
+@functools.lru_cache(maxsize=None)
+def _get_formatter(show_line_number: bool, datefmt: str) -> logging.Formatter:
+    """
+    Return a shared formatter for the given options, so loggers reuse a single instance.
+    """
+    formatter = logging.Formatter(_FORMAT_WITH_LINE if show_line_number else _FORMAT_NO_LINE, datefmt)
+    formatter.default_msec_format = None
+    return formatter
+
 
 def create_console_logger(
     name: str = "prelude",
@@ -19,20 +32,19 @@ def create_console_logger(
         datefmt (str): Date format for the log messages.
 
     Returns:
-        logging.Logger: Configured logger.
+        logging.Logger: Configured logger. If the logger already has handlers attached, it is returned
+        unchanged so repeated calls do not duplicate output.
     """
     logger = logging.getLogger(name)
-    handler = logging.StreamHandler()
+    if logger.handlers:
+        return logger
 
-    if show_line_number:
-        format = "%(asctime)s - %(levelname)s - %(name)s - %(funcName)s:%(lineno)d - %(message)s"
-    else:
-        format = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
-    formatter = logging.Formatter(format, datefmt)
-    handler.setFormatter(formatter)
+    handler = logging.StreamHandler()
+    handler.setFormatter(_get_formatter(show_line_number, datefmt))
 
     logger.addHandler(handler)
     logger.setLevel(level)
+    logger.propagate = False
 
     return logger
 
@@ -45,6 +57,8 @@ def report_traceback(
     """
     Log detailed information about an exception, including its type, message, and full traceback.
 
+    All details are emitted as a single log record, so the output stays contiguous under concurrent logging.
+
     This function logs comprehensive details of an exception, including the exception type,
     message, and traceback. It is useful for error reporting in production environments,
     especially where stack traces might otherwise be suppressed.
@@ -88,12 +102,10 @@ def report_traceback(
     if logger is None:
         logger = logging.getLogger(__name__)
 
-    error_type = type(e).__name__
-    error_message = str(e)
-    traceback_info = traceback.format_exc()
-
-    logger.error(prefix_message)
-    logger.error(f"Error Type: {error_type}")
-    logger.error(f"Error Message: {error_message}")
-    logger.error("Traceback:")
-    logger.error(traceback_info)
+    logger.error(
+        "%s\nError Type: %s\nError Message: %s",
+        prefix_message,
+        type(e).__name__,
+        e,
+        exc_info=(type(e), e, e.__traceback__),
+    )
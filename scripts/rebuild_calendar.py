@@ -0,0 +1,47 @@
+import argparse
+
+import polars as pl
+
+from prelude.log_utils import create_console_logger
+
+
+logger = create_console_logger(name=__name__)
+
+
+def rebuild_calendar(src: str, dst: str, row_group_size: int = 512) -> None:
+    """
+    Rewrite a calendar Parquet file sorted by `TradeDate` with small, statistics-bearing row groups.
+
+    Parameters
+    ----------
+    src : str
+        Path to the source calendar file.
+    dst : str
+        Path to write the rebuilt calendar file to. May be the same as `src`.
+    row_group_size : int, optional
+        The number of rows per row group, by default 512.
+
+    Notes
+    -----
+    Calendar files must be sorted by `TradeDate` with unique dates. Sorting keeps the per-row-group
+    min/max statistics narrow so readers can skip row groups outside a date range, and matches the
+    order that `prelude.calendar` relies on for binary searches.
+    """
+    df_cal = pl.read_parquet(src).sort("TradeDate")
+
+    n_dupes = df_cal.height - df_cal["TradeDate"].n_unique()
+    if n_dupes:
+        raise ValueError(f"{src} contains {n_dupes} duplicate TradeDate rows")
+
+    df_cal.write_parquet(dst, row_group_size=row_group_size, statistics=True, compression="zstd")
+    logger.info(f"Wrote {df_cal.height} rows to {dst}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild a calendar Parquet file sorted by TradeDate.")
+    parser.add_argument("src", help="Path to the source calendar file.")
+    parser.add_argument("dst", nargs="?", help="Output path, defaults to overwriting the source.")
+    parser.add_argument("--row-group-size", type=int, default=512, help="Rows per row group.")
+    args = parser.parse_args()
+
+    rebuild_calendar(args.src, args.dst or args.src, args.row_group_size)